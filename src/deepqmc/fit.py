@@ -28,8 +28,12 @@ __all__ = ()
 TrainState = namedtuple('TrainState', 'sampler params opt')
 
 
-def median_clip_and_mask(x, clip_width, median_center, exclude_width=jnp.inf):
-    clip_center = all_device_median(x) if median_center else all_device_mean(x)
+def median_clip_and_mask(
+    x, clip_width, median_center, exclude_width=jnp.inf, approx=False
+):
+    clip_center = (
+        all_device_median(x, approx=approx) if median_center else all_device_mean(x)
+    )
     abs_diff = jnp.abs(x - clip_center)
     mad = all_device_mean(abs_diff)
     x_clip = jnp.clip(x, clip_center - clip_width * mad, clip_center + clip_width * mad)
@@ -38,12 +42,12 @@ def median_clip_and_mask(x, clip_width, median_center, exclude_width=jnp.inf):
 
 
 def median_log_squeeze_and_mask(
-    x, clip_width=1.0, quantile=0.95, exclude_width=jnp.inf
+    x, clip_width=1.0, quantile=0.95, exclude_width=jnp.inf, approx=False
 ):
-    x_median = all_device_median(x)
+    x_median = all_device_median(x, approx=approx)
     x_diff = x - x_median
     x_abs_diff = jnp.abs(x_diff)
-    quantile = all_device_quantile(x_abs_diff, quantile)
+    quantile = all_device_quantile(x_abs_diff, quantile, approx=approx)
     width = clip_width * quantile
     x_clip = x_median + 2 * width * log_squeeze(x_diff / (2 * width))
     gradient_mask = x_abs_diff / quantile < exclude_width
@@ -70,6 +74,11 @@ def fit_wf(  # noqa: C901
     clip_mask_fn=None,
 ):
     device_count = jax.device_count()
+    weight_shape = (
+        device_count,
+        molecule_idx_sampler.batch_size,
+        electron_batch_size // device_count,
+    )
 
     @partial(jax.custom_jvp, nondiff_argnums=(1, 2))
     def loss_fn(params, rng, batch):
@@ -80,15 +89,22 @@ def fit_wf(  # noqa: C901
             jax.vmap(hamil.local_energy(partial(ansatz.apply, params)))
         )(rng_batch, phys_conf)
         loss = pmean(jnp.nanmean(E_loc * weight))
+        if not hamil_stats:
+            hamil_means = {}
+        elif len({v.shape for v in hamil_stats.values()}) == 1:
+            # average all hamiltonian stats over the electron batch (axis 1)
+            # in a single reduction of the stacked (n_stats, mol, elec, ...) array
+            hamil_means = dict(
+                zip(hamil_stats, jnp.stack(list(hamil_stats.values())).mean(axis=2))
+            )
+        else:
+            hamil_means = {k: v.mean(axis=1) for k, v in hamil_stats.items()}
         stats = {
             'E_loc/mean': jnp.nanmean(E_loc, axis=1),
             'E_loc/std': jnp.nanstd(E_loc, axis=1),
             'E_loc/min': jnp.nanmin(E_loc, axis=1),
             'E_loc/max': jnp.nanmax(E_loc, axis=1),
-            **{
-                k_hamil: v_hamil.mean(axis=1)
-                for k_hamil, v_hamil in hamil_stats.items()
-            },
+            **hamil_means,
         }
         return loss, (E_loc, stats)
 
@@ -215,7 +231,15 @@ def fit_wf(  # noqa: C901
 
     @pmap
     def sample_wf(state, rng, params, idxs):
-        return sampler.sample(rng, state, partial(ansatz.apply, params), idxs)
+        state, phys_conf, stats = sampler.sample(
+            rng, state, partial(ansatz.apply, params), idxs
+        )
+        log_weight = (
+            state['log_weight'][idxs]
+            if 'log_weight' in state.keys()
+            else jnp.zeros(weight_shape[1:])
+        )
+        return state, phys_conf, pexp_normalize_mean(log_weight), stats
 
     @pmap
     def update_sampler(state, params):
@@ -224,20 +248,9 @@ def fit_wf(  # noqa: C901
     def train_step(rng, step, smpl_state, params, opt_state):
         rng_sample, rng_kfac = split_on_devices(rng, 2)
         mol_idxs = molecule_idx_sampler.sample()
-        smpl_state, phys_conf, smpl_stats = sample_wf(
+        smpl_state, phys_conf, weight, smpl_stats = sample_wf(
             smpl_state, rng_sample, params, mol_idxs
         )
-        weight = pmap(pexp_normalize_mean)(
-            smpl_state['log_weight'][jnp.arange(device_count)[:, None], mol_idxs]
-            if 'log_weight' in smpl_state.keys()
-            else jnp.zeros(
-                (
-                    device_count,
-                    molecule_idx_sampler.batch_size,
-                    electron_batch_size // device_count,
-                )
-            )
-        )
         params, opt_state, E_loc, stats = _step(
             rng_kfac,
             params,
@@ -254,25 +267,20 @@ def fit_wf(  # noqa: C901
     if opt is not None and opt_state is None:
         rng, rng_sample, rng_opt = split_on_devices(rng, 3)
         idxs = molecule_idx_sampler.sample()
-        _, init_phys_conf, _ = sample_wf(smpl_state, rng_sample, params, idxs)
+        _, init_phys_conf, _, _ = sample_wf(smpl_state, rng_sample, params, idxs)
         opt_state = init_opt(
             rng_opt,
             params,
-            (
-                init_phys_conf,
-                jnp.ones(
-                    (
-                        device_count,
-                        molecule_idx_sampler.batch_size,
-                        electron_batch_size // device_count,
-                    )
-                ),
-            ),
+            (init_phys_conf, jnp.ones(weight_shape)),
         )
     train_state = smpl_state, params, opt_state
 
     for step, rng in zip(steps, rng_iterator(rng)):
         *train_state, E_loc, mol_idxs, stats = train_step(rng, step, *train_state)
-        yield step, TrainState(*train_state), gather_electrons_on_one_device(
-            E_loc
-        ), select_one_device(mol_idxs), stats
+        yield (
+            step,
+            TrainState(*train_state),
+            gather_electrons_on_one_device(E_loc),
+            select_one_device(mol_idxs),
+            stats,
+        )
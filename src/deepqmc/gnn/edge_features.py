@@ -1,10 +1,18 @@
 import jax.numpy as jnp
+import numpy as np
 
 from ..utils import norm
 
 
 class EdgeFeature:
-    r"""Base class for all edge features."""
+    r"""Base class for all edge features.
+
+    Edge features are called as ``feature(d, r=r)`` with the difference vectors
+    :data:`d` of the edges and the keyword-only lengths :data:`r` of the edges.
+    :data:`r` is :data:`None` unless precomputed by the caller, e.g. by
+    :class:`CombinedEdgeFeature`, so subclasses have to accept it and compute
+    the lengths themselves if it is not given.
+    """
 
     def __len__(self):
         """Return the length of the output feature vector."""
@@ -17,9 +25,9 @@ class DifferenceEdgeFeature(EdgeFeature):
     def __init__(self, *, log_rescale=False):
         self.log_rescale = log_rescale
 
-    def __call__(self, d):
+    def __call__(self, d, *, r=None):
         if self.log_rescale:
-            r = norm(d, safe=True)
+            r = norm(d, safe=True) if r is None else r
             d *= (jnp.log1p(r) / r)[..., None]
         return d
 
@@ -33,16 +41,15 @@ class DistancePowerEdgeFeature(EdgeFeature):
     def __init__(self, *, powers, eps=None, log_rescale=False):
         if any(p < 0 for p in powers):
             assert eps is not None
-        self.powers = jnp.asarray(powers)
+        self.powers = tuple(powers)
         self.eps = eps or 0.0
         self.log_rescale = log_rescale
 
-    def __call__(self, d):
-        r = norm(d, safe=True)
-        powers = jnp.where(
-            self.powers > 0,
-            r[..., None] ** self.powers,
-            1 / (r[..., None] ** (-self.powers) + self.eps),
+    def __call__(self, d, *, r=None):
+        r = norm(d, safe=True) if r is None else r
+        powers = jnp.stack(
+            [r**p if p > 0 else 1 / (r ** (-p) + self.eps) for p in self.powers],
+            axis=-1,
         )
         if self.log_rescale:
             powers *= (jnp.log1p(r) / r)[..., None]
@@ -66,12 +73,12 @@ class GaussianEdgeFeature(EdgeFeature):
 
     def __init__(self, *, n_gaussian, radius, offset):
         delta = 1 / (2 * n_gaussian) if offset else 0
-        qs = jnp.linspace(delta, 1 - delta, n_gaussian)
+        qs = np.linspace(delta, 1 - delta, n_gaussian)
         self.mus = radius * qs**2
         self.sigmas = (1 + radius * qs) / 7
 
-    def __call__(self, d):
-        r = norm(d, safe=True)
+    def __call__(self, d, *, r=None):
+        r = norm(d, safe=True) if r is None else r
         gaussians = jnp.exp(-((r[..., None] - self.mus) ** 2) / self.sigmas**2)
         return gaussians
 
@@ -90,8 +97,9 @@ class CombinedEdgeFeature(EdgeFeature):
     def __init__(self, *, features):
         self.features = features
 
-    def __call__(self, d):
-        return jnp.concatenate([f(d) for f in self.features], axis=-1)
+    def __call__(self, d, *, r=None):
+        r = norm(d, safe=True) if r is None else r
+        return jnp.concatenate([f(d, r=r) for f in self.features], axis=-1)
 
     def __len__(self):
         return sum(map(len, self.features))
@@ -1,7 +1,9 @@
 from collections import namedtuple
+from functools import lru_cache
 
 import jax.numpy as jnp
 import jax_dataclasses as jdc
+import numpy as np
 
 GraphNodes = namedtuple('GraphNodes', 'nuclei electrons')
 Graph = namedtuple('Graph', 'nodes edges')
@@ -13,20 +15,31 @@ __all__ = [
 ]
 
 
+@lru_cache
 def offdiagonal_sender_idx(n_node):
-    return (
-        jnp.arange(n_node)[None, :] <= jnp.arange(n_node - 1)[:, None]
-    ) + jnp.arange(n_node - 1)[:, None]
+    edge_idx = np.arange(n_node - 1)[:, None]
+    idx = (np.arange(n_node)[None, :] <= edge_idx) + edge_idx
+    idx.flags.writeable = False
+    return idx
+
+
+@lru_cache
+def offdiagonal_receiver_idx(n_node):
+    return np.broadcast_to(np.arange(n_node)[None], (n_node - 1, n_node))
+
+
+def filter_diagonal_edges(diffs):
+    assert diffs.shape[-3] == diffs.shape[-2]
+    n_node = diffs.shape[-2]
+    sender_idx = offdiagonal_sender_idx(n_node)
+    receiver_idx = offdiagonal_receiver_idx(n_node)
+    return diffs[..., sender_idx, receiver_idx, :]
 
 
 def compute_edges(pos_sender, pos_receiver, filter_diagonal):
     diffs = pos_receiver[..., None, :, :] - pos_sender[..., None, :]
     if filter_diagonal:
-        assert pos_sender.shape[-2] == pos_receiver.shape[-2]
-        n_node = pos_sender.shape[-2]
-        receiver_idx = jnp.broadcast_to(jnp.arange(n_node)[None], (n_node - 1, n_node))
-        sender_idx = offdiagonal_sender_idx(n_node)
-        diffs = diffs[..., sender_idx, receiver_idx, :]
+        diffs = filter_diagonal_edges(diffs)
     return diffs
 
 
@@ -92,6 +105,7 @@ def MolecularGraphEdgeBuilder(n_nuc, n_up, n_down, edge_types, *, self_interacti
             considered
     """
     n_elec = n_up + n_down
+    ee_edge_types = {'same', 'anti', 'up', 'down'}
     builder_mapping = {
         'nn': ['nn'],
         'ne': ['ne'],
@@ -148,24 +162,33 @@ def MolecularGraphEdgeBuilder(n_nuc, n_up, n_down, edge_types, *, self_interacti
         builder_type: GraphEdgeBuilder(
             **fix_kwargs_of_builder_type[builder_type],
         )
-        for edge_type in edge_types
+        for edge_type in set(edge_types) - ee_edge_types
         for builder_type in builder_mapping[edge_type]
     }
+    # (sender, receiver) blocks of the electron-electron differences
+    ee_blocks = {
+        'uu': (slice(None, n_up), slice(None, n_up)),
+        'dd': (slice(n_up, None), slice(n_up, None)),
+        'du': (slice(n_up, None), slice(None, n_up)),
+        'ud': (slice(None, n_up), slice(n_up, None)),
+        'up': (slice(None, n_up), slice(None)),
+        'down': (slice(n_up, None), slice(None)),
+    }
+
+    def ee_edges(ee, builder_type):
+        edges = ee[ee_blocks[builder_type]]
+        if fix_kwargs_of_builder_type[builder_type]['mask_self']:
+            edges = filter_diagonal_edges(edges)
+        return edges
 
     build_rules = {
-        'nn': lambda pc: SimpleGraphEdges(builders['nn'](pc.R, pc.R)),
-        'ne': lambda pc: SimpleGraphEdges(builders['ne'](pc.R, pc.r)),
-        'en': lambda pc: SimpleGraphEdges(builders['en'](pc.r, pc.R)),
-        'same': lambda pc: SameGraphEdges(
-            builders['uu'](pc.r[:n_up], pc.r[:n_up]),
-            builders['dd'](pc.r[n_up:], pc.r[n_up:]),
-        ),
-        'anti': lambda pc: AntiGraphEdges(
-            builders['du'](pc.r[n_up:], pc.r[:n_up]),
-            builders['ud'](pc.r[:n_up], pc.r[n_up:]),
-        ),
-        'up': lambda pc: UpGraphEdges(builders['up'](pc.r[:n_up], pc.r)),
-        'down': lambda pc: DownGraphEdges(builders['down'](pc.r[n_up:], pc.r)),
+        'nn': lambda pc, ee: SimpleGraphEdges(builders['nn'](pc.R, pc.R)),
+        'ne': lambda pc, ee: SimpleGraphEdges(builders['ne'](pc.R, pc.r)),
+        'en': lambda pc, ee: SimpleGraphEdges(builders['en'](pc.r, pc.R)),
+        'same': lambda pc, ee: SameGraphEdges(ee_edges(ee, 'uu'), ee_edges(ee, 'dd')),
+        'anti': lambda pc, ee: AntiGraphEdges(ee_edges(ee, 'du'), ee_edges(ee, 'ud')),
+        'up': lambda pc, ee: UpGraphEdges(ee_edges(ee, 'up')),
+        'down': lambda pc, ee: DownGraphEdges(ee_edges(ee, 'down')),
     }
 
     def build(phys_conf):
@@ -180,8 +203,14 @@ def MolecularGraphEdgeBuilder(n_nuc, n_up, n_down, edge_types, *, self_interacti
         """
         assert phys_conf.r.shape[0] == n_up + n_down
 
+        # all electron-electron edge types are sliced from a single difference array
+        ee = (
+            compute_edges(phys_conf.r, phys_conf.r, False)
+            if any(typ in ee_edge_types for typ in edge_types)
+            else None
+        )
         edges = {
-            edge_type: build_rules[edge_type](phys_conf) for edge_type in edge_types
+            edge_type: build_rules[edge_type](phys_conf, ee) for edge_type in edge_types
         }
         return edges
 
@@ -231,9 +260,12 @@ class GraphEdges:
     def sum_senders(self, normalize=False):
         raise NotImplementedError
 
-    def convolve(self, nodes, normalize=False):
+    def scale_by_senders(self, nodes):
         raise NotImplementedError
 
+    def convolve(self, nodes, normalize=False):
+        return self.scale_by_senders(nodes).sum_senders(normalize)
+
 
 @jdc.pytree_dataclass
 class SimpleGraphEdges(GraphEdges):
@@ -249,23 +281,20 @@ class SimpleGraphEdges(GraphEdges):
     def sum_senders(self, normalize=False):
         return (jnp.mean if normalize else jnp.sum)(self.edges, axis=-3)
 
-    def convolve(self, nodes, normalize=False):
-        edge_node_product = self.edges * nodes[:, None]
-        return self.__class__(edge_node_product).sum_senders(normalize)
+    def scale_by_senders(self, nodes):
+        return self.__class__(self.edges * nodes[:, None])
 
 
 @jdc.pytree_dataclass
 class UpGraphEdges(SimpleGraphEdges):
-    def convolve(self, nodes, normalize=False):
-        up = self.edges * nodes[: self.edges.shape[-3], None]
-        return self.__class__(up).sum_senders(normalize)
+    def scale_by_senders(self, nodes):
+        return self.__class__(self.edges * nodes[: self.edges.shape[-3], None])
 
 
 @jdc.pytree_dataclass
 class DownGraphEdges(SimpleGraphEdges):
-    def convolve(self, nodes, normalize=False):
-        down = self.edges * nodes[-self.edges.shape[-3] :, None]
-        return self.__class__(down).sum_senders(normalize)
+    def scale_by_senders(self, nodes):
+        return self.__class__(self.edges * nodes[-self.edges.shape[-3] :, None])
 
 
 @jdc.pytree_dataclass
@@ -304,7 +333,11 @@ class SameGraphEdges(GraphEdges):
         )
         return jnp.concatenate([up, down], axis=-2)
 
-    def convolve(self, nodes, normalize=False):
+    @property
+    def receiver_blocks(self):
+        return self.uu, self.dd
+
+    def scale_by_senders(self, nodes):
         self_interaction = self.uu.shape[-3] == self.uu.shape[-2]
         up_node_idx = (
             (slice(None, self.uu.shape[-2]), None)
@@ -318,7 +351,7 @@ class SameGraphEdges(GraphEdges):
         )
         uu = self.uu * nodes[up_node_idx]
         dd = self.dd * nodes[down_node_idx]
-        return self.__class__(uu, dd).sum_senders(normalize)
+        return self.__class__(uu, dd)
 
 
 @jdc.pytree_dataclass
@@ -355,7 +388,32 @@ class AntiGraphEdges(GraphEdges):
         )
         return jnp.concatenate([up, down], axis=-2)
 
-    def convolve(self, nodes, normalize=False):
+    @property
+    def receiver_blocks(self):
+        return self.du, self.ud
+
+    def scale_by_senders(self, nodes):
         du = self.du * nodes[self.du.shape[-2] :, None]
         ud = self.ud * nodes[: self.du.shape[-2], None]
-        return self.__class__(du, ud).sum_senders(normalize)
+        return self.__class__(du, ud)
+
+
+def sum_electron_senders(*edges):
+    r"""Sum electron-electron edges of several types over all electron senders.
+
+    The edges sent to the spin-up and spin-down electrons are concatenated along
+    the sender axis across the edge types, such that a single reduction is
+    performed per receiver spin.
+
+    Args:
+        edges (Sequence[SameGraphEdges | AntiGraphEdges]): the edges to sum.
+
+    Returns:
+        float, (:math:`N_\text{elec}`, :math:`N_\text{feat}`): the unnormalized
+        sum over all senders for each electron.
+    """
+    up, down = (
+        jnp.concatenate(blocks, axis=-3).sum(axis=-3)
+        for blocks in zip(*(e.receiver_blocks for e in edges))
+    )
+    return jnp.concatenate([up, down], axis=-2)
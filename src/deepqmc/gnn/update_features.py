@@ -4,6 +4,7 @@ import haiku as hk
 import jax.numpy as jnp
 
 from ..hkext import Identity
+from .graph import sum_electron_senders
 
 
 class UpdateFeature(hk.Module):
@@ -90,11 +91,7 @@ class EdgeSumUpdateFeature(UpdateFeature):
             if edge_type == 'ee':
                 factor = self.n_up + self.n_down if self.normalize else 1.0
                 updates.append(
-                    (
-                        edges['same'].sum_senders(False)
-                        + edges['anti'].sum_senders(False)
-                    )
-                    / factor
+                    sum_electron_senders(edges['same'], edges['anti']) / factor
                 )
             else:
                 updates.append(edges[edge_type].sum_senders(self.normalize))
@@ -129,7 +126,14 @@ class ConvolutionUpdateFeature(UpdateFeature):
         self.w_factory = w_factory
         self.w_for_ne = w_for_ne
 
-    def single_edge_type_update(self, nodes, edges, edge_type, normalize):
+    @hk.transparent
+    def single_edge_type_messages(self, nodes, edges, edge_type):
+        r"""Return the messages along the edges of a single type.
+
+        Transparent to haiku, such that the parameters are created in the scope
+        of :meth:`single_edge_type_update`. Returns :data:`None` if there are
+        no edges of the given type.
+        """
         w = (
             self.w_factory(self.two_particle_stream_dim, name=f'w_{edge_type}')
             if self.w_for_ne or edge_type != 'ne'
@@ -140,26 +144,34 @@ class ConvolutionUpdateFeature(UpdateFeature):
         hx = h(self.node_edge_mapping.sender_data_of(edge_type, nodes))
         if edges[edge_type].single_array.size == 0:
             # parameters acting on size zero arrays cause NaN gradients
-            return jnp.zeros((hx.shape[0], self.two_particle_stream_dim))
-        return edges[edge_type].update_from_single_array(we).convolve(hx, normalize)
+            return None
+        return edges[edge_type].update_from_single_array(we).scale_by_senders(hx)
 
-    def __call__(self, nodes, edges) -> Sequence[jnp.ndarray]:
-        updates = []
-        for edge_type in self.edge_types:
-            if edge_type == 'ee':
-                ee = sum(
-                    self.single_edge_type_update(nodes, edges, st, False)
-                    for st in ['same', 'anti']
-                )
-                factor = self.n_up + self.n_down if self.normalize else 1.0
-                updates.append(ee / factor)
-            else:
-                updates.append(
-                    self.single_edge_type_update(
-                        nodes, edges, edge_type, self.normalize
-                    )
+    def single_edge_type_update(self, nodes, edges, edge_type, normalize):
+        if edge_type == 'ee':
+            # aggregate the same and anti messages in a single reduction
+            messages = [
+                self.single_edge_type_messages(nodes, edges, st)
+                for st in ['same', 'anti']
+            ]
+            messages = [m for m in messages if m is not None]
+            if not messages:
+                return jnp.zeros(
+                    (self.n_up + self.n_down, self.two_particle_stream_dim)
                 )
-        return updates
+            factor = self.n_up + self.n_down if normalize else 1.0
+            return sum_electron_senders(*messages) / factor
+        messages = self.single_edge_type_messages(nodes, edges, edge_type)
+        if messages is None:
+            n_node = self.node_edge_mapping.sender_data_of(edge_type, nodes).shape[0]
+            return jnp.zeros((n_node, self.two_particle_stream_dim))
+        return messages.sum_senders(normalize)
+
+    def __call__(self, nodes, edges) -> Sequence[jnp.ndarray]:
+        return [
+            self.single_edge_type_update(nodes, edges, edge_type, self.normalize)
+            for edge_type in self.edge_types
+        ]
 
     @property
     def names(self):
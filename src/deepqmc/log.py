@@ -2,6 +2,7 @@ import pickle
 from collections import namedtuple
 from pathlib import Path
 
+import jax
 import jax.numpy as jnp
 import numpy as np
 import tensorboard.summary
@@ -133,6 +134,7 @@ class TensorboardMetricLogger:
         self.write_in_full_dataset_format(step, stats, mol_idxs, prefix)
 
     def write_in_full_dataset_format(self, step, stats, mol_idxs, prefix):
+        stats, mol_idxs = jax.device_get((stats, mol_idxs))
         for k, v in stats.items():
             if v.ndim == 0:
                 # Global statistic
@@ -108,25 +108,50 @@ def all_device_mean(x, axis_name=PMAP_AXIS_NAME):
     return pmean(jax.numpy.mean(x), axis_name)
 
 
-def all_device_median(x, axis_name=PMAP_AXIS_NAME):
+def approx_quantile(x, quantile):
+    r"""Approximate a quantile by the nearest lower order statistic.
+
+    Selects the values above the quantile with :func:`jax.lax.approx_max_k`,
+    and does not interpolate between neighbouring order statistics. This only
+    pays off over a sort for upper quantiles on TPUs, elsewhere the top-k
+    selection is exact and in general no cheaper than the sort.
+
+    Args:
+        x: the input data, flattened before the computation.
+        quantile: probability for the quantile to compute.
+    """
+    x = x.ravel()
+    k = x.size - int(quantile * (x.size - 1))
+    return jax.lax.approx_max_k(x, k)[0].min()
+
+
+def all_device_median(x, axis_name=PMAP_AXIS_NAME, approx=False):
     r"""Compute median across all devices.
 
     Args:
         x: the input data stored on multiple devices.
         axis_name: optional, name of pmap-ed axis.
+        approx: optional, if :data:`True` use :func:`approx_quantile`.
     """
-    return jax.numpy.median(jax.lax.all_gather(x, axis_name))
+    x = jax.lax.all_gather(x, axis_name)
+    if approx:
+        return approx_quantile(x, 0.5)
+    return jax.numpy.median(x)
 
 
-def all_device_quantile(x, quantile, axis_name=PMAP_AXIS_NAME):
+def all_device_quantile(x, quantile, axis_name=PMAP_AXIS_NAME, approx=False):
     r"""Compute quantiles across all devices.
 
     Args:
         x: the input data stored on multiple devices.
         quantile: probability for the quantiles to compute.
         axis_name: optional, name of pmap-ed axis.
+        approx: optional, if :data:`True` use :func:`approx_quantile`.
     """
-    return jax.numpy.quantile(jax.lax.all_gather(x, axis_name), quantile)
+    x = jax.lax.all_gather(x, axis_name)
+    if approx:
+        return approx_quantile(x, quantile)
+    return jax.numpy.quantile(x, quantile)
 
 
 @partial(jax.pmap, axis_name='gather_axis')
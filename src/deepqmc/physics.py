@@ -2,7 +2,7 @@ import jax
 import jax.numpy as jnp
 
 from .types import Potential
-from .utils import norm, triu_flat
+from .utils import norm, triu_flat, triu_indices
 
 __all__ = ()
 
@@ -17,12 +17,11 @@ def pairwise_diffs(coords1, coords2):
 
 
 def pairwise_self_distance(coords, full=False):
-    i, j = jnp.triu_indices(coords.shape[-2], k=1)
-    diffs = coords[..., :, None, :] - coords[..., None, :, :]
-    dists = norm(diffs[..., i, j, :], safe=True, axis=-1)
+    i, j = triu_indices(coords.shape[-2], k=1)
+    dists = norm(coords[..., i, :] - coords[..., j, :], safe=True, axis=-1)
     if full:
         dists = (
-            jnp.zeros(diffs.shape[:-1])
+            jnp.zeros((*coords.shape[:-1], coords.shape[-2]))
             .at[..., i, j]
             .set(dists)
             .at[..., j, i]
@@ -1,5 +1,7 @@
 import logging
+from collections import deque
 from functools import partial
+from itertools import islice
 from statistics import mean, stdev
 
 import jax
@@ -421,14 +423,15 @@ def equilibrate(
         return sampler.sample(rng, state, wf, mol_idxs)
 
     buffer_size = block_size * n_blocks
-    buffer = []
+    buffer = deque(maxlen=buffer_size)
     for step, rng in zip(steps, rng_iterator(rng)):
         mol_idxs = molecule_idx_sampler.sample()
         state, phys_conf, stats = sample_wf(rng, state, mol_idxs)
         yield step, state, select_one_device(mol_idxs), stats
-        buffer = [*buffer[-buffer_size + 1 :], criterion(phys_conf).item()]
+        buffer.append(criterion(phys_conf).item())
         if len(buffer) < buffer_size:
             continue
-        b1, b2 = buffer[:block_size], buffer[-block_size:]
+        b1 = list(islice(buffer, block_size))
+        b2 = list(islice(buffer, buffer_size - block_size, None))
         if abs(mean(b1) - mean(b2)) < min(stdev(b1), stdev(b2)):
             break
@@ -9,6 +9,7 @@ import h5py
 import jax
 import jax.numpy as jnp
 import kfac_jax
+import numpy as np
 import optax
 from jax import tree_util
 from tqdm.auto import tqdm, trange
@@ -322,13 +323,15 @@ def train(  # noqa: C901
                     for energy, mol_idx in zip(per_mol_energy, mol_idxs):
                         ewm_states[mol_idx] = update_ewm(energy, ewm_states[mol_idx])
                         ewm_energies.append(ewm_states[mol_idx].mean)
-                    ene = [
+                    ewm_means, ewm_sqerrs = jax.device_get(
                         (
-                            ufloat(ewm.mean, jnp.sqrt(ewm.sqerr))
-                            if ewm.mean
-                            else ufloat(jnp.nan, 0)
+                            [ewm.mean for ewm in ewm_states],
+                            [ewm.sqerr for ewm in ewm_states],
                         )
-                        for ewm in ewm_states
+                    )
+                    ene = [
+                        ufloat(mean, np.sqrt(sqerr)) if mean else ufloat(np.nan, 0)
+                        for mean, sqerr in zip(ewm_means, ewm_sqerrs)
                     ]
                     if all(e.s for e in ene):
                         energies = '|'.join(f'{e:S}' for e in ene)
@@ -1,7 +1,12 @@
+from functools import lru_cache
+
 import jax
 import jax.numpy as jnp
+import numpy as np
 from jax import ops
+from jax.lax import linalg as lax_linalg
 from jax.random import uniform
+from jax.scipy.linalg import lu_solve
 from jax.scipy.special import gammaln
 
 __all__ = ()
@@ -23,7 +28,7 @@ def multinomial_resampling(rng, weights, n_samples=None):
     n = len(weights)
     n_samples = n_samples or n
     weights_normalized = weights / jnp.sum(weights)
-    i, j = jnp.triu_indices(n)
+    i, j = triu_indices(n)
     weights_cum = jnp.zeros((n, n)).at[i, j].set(weights_normalized[j]).sum(axis=-1)
     return n - 1 - (uniform(rng, (n_samples,))[:, None] > weights_cum).sum(axis=-1)
 
@@ -42,13 +47,21 @@ def masked_mean(x, mask):
     return x.sum() / jnp.sum(mask)
 
 
+@lru_cache
+def triu_indices(n, k=0):
+    r"""Return cached host-side indices of the upper triangle of an ``n x n`` array."""
+    i, j = np.triu_indices(n, k)
+    i.flags.writeable = j.flags.writeable = False
+    return i, j
+
+
 def triu_flat(x):
-    i, j = jnp.triu_indices(x.shape[-1], 1)
+    i, j = triu_indices(x.shape[-1], 1)
     return x[..., i, j]
 
 
 def tree_norm(x):
-    return jax.tree_util.tree_reduce(lambda norm, x: norm + jnp.linalg.norm(x), x, 0)
+    return jnp.sqrt(sum(jnp.vdot(leaf, leaf) for leaf in jax.tree_util.tree_leaves(x)))
 
 
 def norm(rs, safe=False, axis=-1):
@@ -117,6 +130,36 @@ def per_mol_stats(n_mols, data, mol_idx, prefix, mean_only=False):
     }
 
 
+def _slogdet_from_lu(lu, pivots):
+    diag = jnp.diagonal(lu, axis1=-2, axis2=-1)
+    # row swaps and negative pivots each flip the sign, so only their parity matters
+    parity = jnp.count_nonzero(pivots != jnp.arange(lu.shape[-1]), axis=-1)
+    parity += jnp.count_nonzero(diag < 0, axis=-1)
+    sign = jnp.where((diag == 0).any(axis=-1), 0, 1 - 2 * (parity & 1)).astype(lu.dtype)
+    return sign, jnp.log(jnp.abs(diag)).sum(axis=-1)
+
+
+@jax.custom_jvp
+def slogdet(x):
+    r"""Compute the sign and log-absolute value of the determinant.
+
+    Unlike :func:`jax.numpy.linalg.slogdet`, the derivative reuses the LU
+    factorization of the forward pass rather than refactorizing the matrix
+    to solve against the tangents.
+    """
+    lu, pivots, _ = lax_linalg.lu(x)
+    return _slogdet_from_lu(lu, pivots)
+
+
+@slogdet.defjvp
+def _slogdet_jvp(primals, tangents):
+    (x,), (x_dot,) = primals, tangents
+    lu, pivots, _ = lax_linalg.lu(x)
+    sign, logdet = _slogdet_from_lu(lu, pivots)
+    logdet_dot = jnp.trace(lu_solve((lu, pivots), x_dot), axis1=-2, axis2=-1)
+    return (sign, logdet), (jnp.zeros_like(sign), logdet_dot)
+
+
 def log_squeeze(x):
     sgn, x = jnp.sign(x), jnp.abs(x)
     return sgn * jnp.log1p((x + 1 / 2 * x**2 + x**3) / (1 + x**2))
@@ -1,10 +1,11 @@
 import haiku as hk
 import jax
 import jax.numpy as jnp
+import numpy as np
 
-from ...physics import pairwise_diffs, pairwise_self_distance
+from ...physics import pairwise_diffs
 from ...types import Psi
-from ...utils import flatten, triu_flat
+from ...utils import norm, slogdet
 from ..base import WaveFunction
 
 __all__ = ['NeuralNetworkWaveFunction']
@@ -34,10 +35,28 @@ class BackflowOp(hk.Module):
         return xs
 
 
+def electron_pair_idxs(n_up, n_down):
+    r"""Return the electron index pairs entering the electronic cusp.
+
+    The same-spin pairs (upper triangles of the spin-up and spin-down blocks)
+    are followed by all opposite-spin pairs.
+
+    Returns:
+        tuple: the first and second electron indices of the pairs, and the number
+        of same-spin pairs.
+    """
+    i_up, j_up = np.triu_indices(n_up, k=1)
+    i_down, j_down = n_up + np.stack(np.triu_indices(n_down, k=1))
+    i_anti, j_anti = np.divmod(np.arange(n_up * n_down), n_down)
+    i = np.concatenate([i_up, i_down, i_anti])
+    j = np.concatenate([j_up, j_down, n_up + j_anti])
+    return i, j, len(i_up) + len(i_down)
+
+
 def eval_log_slater(xs):
     if xs.shape[-1] == 0:
         return jnp.ones(xs.shape[:-2]), jnp.zeros(xs.shape[:-2])
-    return jnp.linalg.slogdet(xs)
+    return slogdet(xs)
 
 
 class NeuralNetworkWaveFunction(WaveFunction):
@@ -119,7 +138,6 @@ class NeuralNetworkWaveFunction(WaveFunction):
     def __call__(self, phys_conf, return_mos=False):
         diffs_nuc = pairwise_diffs(phys_conf.r, phys_conf.R)
         dists_nuc = jnp.sqrt(diffs_nuc[..., -1])
-        dists_elec = pairwise_self_distance(phys_conf.r, full=True)
         orb = self.envelope(phys_conf)
         jastrow, fs = self.omni(phys_conf) if self.omni else (None, None)
         orb_up, orb_down = (
@@ -148,11 +166,9 @@ class NeuralNetworkWaveFunction(WaveFunction):
         log_psi = jnp.log(jnp.abs(psi)) + xs_shift
         sign_psi = jax.lax.stop_gradient(jnp.sign(psi))
         if self.cusp_electrons:
-            same_dists = jnp.concatenate(
-                [triu_flat(dists_elec[idxs, idxs]) for idxs in self.spin_slices],
-                axis=-1,
-            )
-            anti_dists = flatten(dists_elec[: self.n_up, self.n_up :])
+            i, j, n_same = electron_pair_idxs(self.n_up, self.n_down)
+            dists_elec = norm(phys_conf.r[i] - phys_conf.r[j], safe=True)
+            same_dists, anti_dists = jnp.split(dists_elec, [n_same])
             log_psi += self.cusp_electrons(same_dists, anti_dists)
         if self.cusp_nuclei:
             log_psi += self.cusp_nuclei(dists_nuc)
@@ -0,0 +1,30 @@
+from functools import partial
+
+import jax
+import jax.numpy as jnp
+import pytest
+
+from deepqmc.fit import median_log_squeeze_and_mask
+from deepqmc.parallel import approx_quantile, pmap
+
+
+class TestClipping:
+    @pytest.mark.parametrize('quantile', [0.0, 0.5, 0.95, 1.0])
+    @pytest.mark.parametrize('shape', [(1000,), (4, 251)], ids=['flat', 'nested'])
+    def test_approx_quantile(self, helpers, quantile, shape):
+        x = jax.random.normal(helpers.rng(), shape)
+        assert approx_quantile(x, quantile) == jnp.quantile(x, quantile, method='lower')
+
+    def test_median_log_squeeze_and_mask_approx(self, helpers):
+        # odd batch and quantile on an order statistic, such that the exact
+        # and the approximate clipping agree
+        E_loc = jax.random.normal(helpers.rng(), (1, 2, 1001))
+        devices = jax.devices()[:1]
+        clip = pmap(
+            jax.vmap(partial(median_log_squeeze_and_mask, approx=True)), devices=devices
+        )
+        clip_exact = pmap(jax.vmap(median_log_squeeze_and_mask), devices=devices)
+        (E_loc_s, mask), (E_loc_s_exact, mask_exact) = clip(E_loc), clip_exact(E_loc)
+        assert E_loc_s.shape == mask.shape == E_loc.shape
+        assert jnp.allclose(E_loc_s, E_loc_s_exact)
+        assert (mask == mask_exact).all()
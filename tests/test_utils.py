@@ -0,0 +1,46 @@
+import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
+
+from deepqmc.utils import slogdet
+
+
+def logdet(slogdet_fn):
+    return lambda x: slogdet_fn(x)[1].sum()
+
+
+class TestSlogdet:
+    @pytest.mark.parametrize('shape', [(5, 5), (3, 4, 5, 5)], ids=['single', 'batch'])
+    def test_slogdet(self, helpers, shape):
+        x = jax.random.normal(helpers.rng(), shape)
+        sign, log_abs_det = slogdet(x)
+        sign_ref, log_abs_det_ref = jnp.linalg.slogdet(x)
+        assert (sign == sign_ref).all()
+        assert jnp.allclose(log_abs_det, log_abs_det_ref, atol=1e-5)
+
+    def test_negative_determinant(self):
+        x = jnp.diag(jnp.array([-2.0, 1.0, 3.0]))[jnp.array([1, 0, 2])]
+        sign, log_abs_det = slogdet(x)
+        assert sign == 1.0
+        assert jnp.allclose(log_abs_det, jnp.log(6.0))
+        sign, log_abs_det = slogdet(-jnp.eye(3))
+        assert sign == -1.0
+        assert log_abs_det == 0.0
+
+    def test_singular(self):
+        x = jnp.array([[1.0, 2.0], [2.0, 4.0]])
+        sign, log_abs_det = slogdet(jnp.stack([x, jnp.zeros_like(x)]))
+        assert (sign == 0.0).all()
+        assert jnp.isneginf(log_abs_det).all()
+
+    @pytest.mark.parametrize('shape', [(4, 4), (2, 3, 4, 4)], ids=['single', 'batch'])
+    def test_derivatives(self, helpers, shape):
+        x = jax.random.normal(helpers.rng(), shape)
+        fn, fn_ref = logdet(slogdet), logdet(jnp.linalg.slogdet)
+        np.testing.assert_allclose(
+            jax.grad(fn)(x), jax.grad(fn_ref)(x), rtol=1e-4, atol=1e-5
+        )
+        np.testing.assert_allclose(
+            jax.hessian(fn)(x), jax.hessian(fn_ref)(x), rtol=1e-4, atol=1e-4
+        )